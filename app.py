@@ -1,39 +1,74 @@
-import ast
-import operator
+from collections import deque
 import ctypes
 from ctypes import wintypes
+import functools
+from itertools import islice
 import math
+import re
 import sys
 import tkinter as tk
 from tkinter import messagebox, ttk
 
+# Resolved once at import; None where the DWM API is unavailable (non-Windows, very old Windows).
+_dwm_set_window_attribute = None
+if sys.platform == "win32":
+    try:
+        _dwm_set_window_attribute = ctypes.windll.dwmapi.DwmSetWindowAttribute
+        # Explicit signature: ctypes converts arguments directly instead of guessing.
+        _dwm_set_window_attribute.argtypes = [wintypes.HWND, wintypes.DWORD, ctypes.c_void_p, wintypes.DWORD]
+        _dwm_set_window_attribute.restype = ctypes.c_long
+    except (AttributeError, OSError):
+        _dwm_set_window_attribute = None
+
 
 class Tooltip:
-    """Create a tooltip for a Tkinter widget."""
-    
-    def __init__(self, widget, text: str):
-        self.widget = widget
-        self.text = text
-        self.tooltip = None
-        widget.bind("<Enter>", self._show_tooltip)
-        widget.bind("<Leave>", self._hide_tooltip)
+    """Tooltips for Tkinter widgets, driven by one class binding and one shared window."""
+
+    # One hidden window shared by all tooltips; hovering only moves and re-labels it.
+    _shared_top = None
+    _text_var = None
+    _TAG = "Tooltip"
+    _bound = False
+
+    @classmethod
+    def attach(cls, widget, text: str) -> None:
+        """Show ``text`` while the pointer is over ``widget``."""
+        if not cls._bound:
+            # Registered once for the bindtag instead of two bindings per widget.
+            widget.bind_class(cls._TAG, "<Enter>", cls._show_tooltip)
+            widget.bind_class(cls._TAG, "<Leave>", cls._hide_tooltip)
+            cls._bound = True
+        widget.tooltip_text = text
+        widget.bindtags((cls._TAG,) + widget.bindtags())
     
-    def _show_tooltip(self, event):
-        if self.tooltip:
-            return
+    @classmethod
+    def _show_tooltip(cls, event):
+        widget = event.widget
+        if cls._shared_top is None:
+            cls._create_window(widget)
         
         # Get widget position
-        x = self.widget.winfo_rootx() + self.widget.winfo_width() // 2
-        y = self.widget.winfo_rooty() - 25
-        
-        # Create tooltip window
-        self.tooltip = tk.Toplevel(self.widget)
-        self.tooltip.wm_overrideredirect(True)
-        self.tooltip.wm_geometry(f"+{x}+{y}")
+        x = widget.winfo_rootx() + widget.winfo_width() // 2
+        y = widget.winfo_rooty() - 25
         
+        cls._text_var.set(widget.tooltip_text)
+        cls._shared_top.wm_geometry(f"+{x}+{y}")
+        cls._shared_top.deiconify()
+    
+    @classmethod
+    def _hide_tooltip(cls, event):
+        if cls._shared_top is not None:
+            cls._shared_top.withdraw()
+
+    @classmethod
+    def _create_window(cls, widget) -> None:
+        top = tk.Toplevel(widget.winfo_toplevel())
+        top.withdraw()
+        top.wm_overrideredirect(True)
+        cls._text_var = tk.StringVar(master=top)
         label = tk.Label(
-            self.tooltip,
-            text=self.text,
+            top,
+            textvariable=cls._text_var,
             bg="#333333",
             fg="#e2e8f0",
             font=("Segoe UI", 9),
@@ -43,53 +78,188 @@ class Tooltip:
             bd=1,
         )
         label.pack()
-    
-    def _hide_tooltip(self, event):
-        if self.tooltip:
-            self.tooltip.destroy()
-            self.tooltip = None
+        cls._shared_top = top
+
+
+# Drop thousands separators and other whitespace and turn the decimal comma into a
+# dot, all in one pass (no separate strip() needed).
+_NORMALIZE_TABLE = str.maketrans({",": ".", " ": None, "\t": None, "\n": None, "\r": None})
+# Everything a normalized expression may contain ("e" for the exponents _format_number emits).
+_ALLOWED_CHARS = frozenset("0123456789.eE+-*/%()")
+# Numbers (with an optional exponent, as _format_number may emit), "**" and one-character operators.
+_TOKEN_RE = re.compile(r"(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][-+]?[0-9]+)?|\*\*|[-+*/%()]")
+
+
+# Binding power of the binary operators. Unary signs sit between "* / %" and "**",
+# so -2*3 == (-2)*3 but -2**2 == -(2**2), exactly as in Python.
+_PRECEDENCE = {"+": 1, "-": 1, "*": 2, "/": 2, "%": 2, "**": 4}
+_UNARY_PRECEDENCE = 3
 
 
 class SafeEvaluator:
-    """Evaluates math expressions using AST to avoid executing arbitrary code."""
-
-    _binary_ops = {
-        ast.Add: operator.add,
-        ast.Sub: operator.sub,
-        ast.Mult: operator.mul,
-        ast.Div: operator.truediv,
-        ast.Pow: operator.pow,
-        ast.Mod: operator.mod,
-    }
-    _unary_ops = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+    """Evaluates math expressions with an operator-precedence parser; nothing is executed.
+
+    Tokens are reduced in one loop over an explicit value stack and operator stack
+    (shunting-yard), with Python's precedence and associativity: ``**`` is
+    right-associative and unary signs bind tighter than ``* / %``.
+    """
 
     @classmethod
     def evaluate(cls, expression: str) -> float:
-        expression = expression.replace(" ", "").replace(",", ".").strip()
+        expression = expression.translate(_NORMALIZE_TABLE)
         if not expression:
             return 0.0
+        # Cheap reject before any parsing: it also keeps float() below from accepting
+        # words such as "inf" or "nan".
+        if not _ALLOWED_CHARS.issuperset(expression):
+            raise ValueError("Ungültiger Ausdruck")
+        # Plain numbers (the common case while typing) need no parser; the last-char
+        # check skips the float() attempt for expressions ending in an operator.
+        if expression[-1] in "0123456789.":
+            try:
+                return float(expression)
+            except ValueError:
+                pass
         try:
-            tree = ast.parse(expression, mode="eval")
-            return float(cls._eval_node(tree.body))
+            return cls._evaluate_normalized(expression)
         except Exception as exc:  # noqa: BLE001 - show a friendly error via UI
             raise ValueError("Ungültiger Ausdruck") from exc
 
     @classmethod
-    def _eval_node(cls, node):
-        if isinstance(node, ast.BinOp) and type(node.op) in cls._binary_ops:
-            left = cls._eval_node(node.left)
-            right = cls._eval_node(node.right)
-            return cls._binary_ops[type(node.op)](left, right)
-        if isinstance(node, ast.UnaryOp) and type(node.op) in cls._unary_ops:
-            return cls._unary_ops[type(node.op)](cls._eval_node(node.operand))
-        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
-            return node.value
-        if isinstance(node, ast.Expr):
-            return cls._eval_node(node.value)
-        raise ValueError("Nicht unterstützter Ausdrucksteil")
+    @functools.lru_cache(maxsize=256)
+    def _evaluate_normalized(cls, expression: str) -> float:
+        """Parse and compute a normalized expression; results are memoized per string."""
+        tokens = _TOKEN_RE.findall(expression)
+        if "".join(tokens) != expression:
+            raise ValueError("Ungültiger Ausdruck")  # characters outside the grammar
+        values: list = []
+        ops: list[tuple[int, str]] = []  # (precedence, operator); "(" has 0 and never reduces
+        expect_operand = True
+        for tok in tokens:
+            if expect_operand:
+                if tok == "(":
+                    ops.append((0, tok))
+                elif tok == "-":
+                    ops.append((_UNARY_PRECEDENCE, "neg"))
+                elif tok == "+":
+                    ops.append((_UNARY_PRECEDENCE, "pos"))
+                elif tok[0] in "0123456789.":
+                    # Keep integers exact (like Python literals) so e.g. 10**400/10**399 still works.
+                    values.append(int(tok) if tok.isdigit() else float(tok))
+                    expect_operand = False
+                else:
+                    raise ValueError("Ungültiger Ausdruck")
+            elif tok == ")":
+                while ops and ops[-1][1] != "(":
+                    cls._reduce(ops.pop()[1], values)
+                if not ops:
+                    raise ValueError("Ungültiger Ausdruck")
+                ops.pop()
+            else:
+                prec = _PRECEDENCE.get(tok)
+                if prec is None:
+                    raise ValueError("Ungültiger Ausdruck")
+                right_assoc = tok == "**"
+                while ops and (ops[-1][0] > prec or (ops[-1][0] == prec and not right_assoc)):
+                    cls._reduce(ops.pop()[1], values)
+                ops.append((prec, tok))
+                expect_operand = True
+        if expect_operand:
+            raise ValueError("Ungültiger Ausdruck")
+        while ops:
+            op = ops.pop()[1]
+            if op == "(":
+                raise ValueError("Ungültiger Ausdruck")
+            cls._reduce(op, values)
+        return float(values[0])
+
+    @staticmethod
+    def _reduce(op: str, values: list) -> None:
+        """Apply ``op`` to the top of the value stack in place."""
+        if op == "neg":
+            values[-1] = -values[-1]
+            return
+        if op == "pos":
+            values[-1] = +values[-1]
+            return
+        rhs = values.pop()
+        lhs = values[-1]
+        if op == "+":
+            values[-1] = lhs + rhs
+        elif op == "-":
+            values[-1] = lhs - rhs
+        elif op == "*":
+            values[-1] = lhs * rhs
+        elif op == "/":
+            values[-1] = lhs / rhs
+        elif op == "%":
+            values[-1] = lhs % rhs
+        else:
+            values[-1] = lhs ** rhs
+
+
+# Typed character -> text appended to the expression ("." becomes the decimal comma).
+_KEY_MAP = {c: c for c in "0123456789,+-*/()%"}
+_KEY_MAP["."] = ","
+_KEY_MAP["^"] = "**"
 
 
 class CalculatorApp:
+    HISTORY_LIMIT = 200
+    LIVE_REFRESH_DELAY_MS = 60  # well below the ~100 ms at which input lag becomes noticeable
+
+    # Swap the grouping/decimal characters of Python's number formatting in one pass.
+    _DIGIT_TRANS = str.maketrans({",": " ", ".": ","})
+
+    # Class tag standing in for "Text" on the display: it carries only the Text bindings
+    # that leave the content alone (mouse selection, scrolling, copy).
+    _DISPLAY_TAG = "CalcDisplay"
+    _DISPLAY_VIRTUAL_EVENTS = frozenset({"<<Copy>>", "<<SelectAll>>", "<<SelectNone>>"})
+
+    colors = {
+        "bg": "#0f172a",
+        "panel": "#111827",
+        "btn": "#1f2937",
+        "btn_text": "#e2e8f0",
+        "btn_active": "#22d3ee",
+        "btn_active_fg": "#0b1223",
+        "accent": "#22d3ee",
+        "display_bg": "#0b1223",
+        "display_fg": "#e2e8f0",
+        "history_bg": "#0b1223",
+        "history_fg": "#e2e8f0",
+        "history_sel_bg": "#22d3ee",
+        "history_sel_fg": "#0b1223",
+        "muted": "#94a3b8",
+        "title": "#0b1223",
+        "title_text": "#e2e8f0",
+        "title_hover": "#1f2937",
+        "close_hover": "#ef4444",
+    }
+
+    # Shared by every keypad button; built once instead of per button.
+    _COMMON_BTN = {
+        "font": ("Segoe UI", 14, "bold"),
+        "width": 4,
+        "height": 2,
+        "bg": colors["btn"],
+        "fg": colors["btn_text"],
+        "activebackground": colors["btn_active"],
+        "activeforeground": colors["btn_active_fg"],
+        "bd": 0,
+        "relief": "flat",
+        "highlightthickness": 0,
+        "cursor": "hand2",
+    }
+    # Make number buttons lighter
+    _DIGIT_BTN = {**_COMMON_BTN, "bg": "#374151"}
+    _EQUALS_BTN = {
+        **_COMMON_BTN,
+        "bg": colors["accent"],
+        "fg": colors["btn_active_fg"],
+        "activebackground": colors["btn_active"],
+    }
+
     def __init__(self) -> None:
         self.root = tk.Tk()
         self.root.title("Rechner")
@@ -98,37 +268,27 @@ class CalculatorApp:
         self.root.grid_rowconfigure(1, weight=1)
         self.root.grid_columnconfigure(0, weight=1)
 
-        self.colors = {
-            "bg": "#0f172a",
-            "panel": "#111827",
-            "btn": "#1f2937",
-            "btn_text": "#e2e8f0",
-            "btn_active": "#22d3ee",
-            "btn_active_fg": "#0b1223",
-            "accent": "#22d3ee",
-            "display_bg": "#0b1223",
-            "display_fg": "#e2e8f0",
-            "history_bg": "#0b1223",
-            "history_fg": "#e2e8f0",
-            "history_sel_bg": "#22d3ee",
-            "history_sel_fg": "#0b1223",
-            "muted": "#94a3b8",
-            "title": "#0b1223",
-            "title_text": "#e2e8f0",
-            "title_hover": "#1f2937",
-            "close_hover": "#ef4444",
-        }
         self.root.configure(bg=self.colors["bg"])
-        self._apply_dark_titlebar()
 
         self.is_maximized = False
         self._drag_offset: tuple[int, int] | None = None
         self.live_result_var = tk.StringVar(value="")
-        self.history: list[tuple[str, str]] = []  # (expression, result_string)
+        # Mirror of the display text; the widget is never read back. Never has leading or
+        # trailing whitespace (input never adds spaces, backspace trims exposed grouping
+        # spaces), so readers need not strip() it.
+        self._expr_cache = ""
+        self._last_expr: str | None = None  # expression currently shown in live_result_var
+        self._live_after_id: str | None = None
+        self.history: deque[tuple[str, str]] = deque(maxlen=self.HISTORY_LIMIT)  # (expression, result_string)
+        self._history_pending = 0  # newest history entries not yet shown in the listbox
         self.normal_geometry = ""
         self._build_ui()
         self._bind_keys()
         self._center_window()
+        # The DWM call blocks. Queue it as a timer rather than an idle callback, because
+        # _center_window's update_idletasks() would run idle work right here in the
+        # constructor. Timers only fire from mainloop, after the first layout and redraw.
+        self.root.after(0, self._apply_dark_titlebar)
 
     def _build_ui(self) -> None:
         container = tk.Frame(self.root, padx=16, pady=16, bg=self.colors["bg"])
@@ -160,6 +320,7 @@ class CalculatorApp:
             pady=8,
         )
         display.grid(row=0, column=0, columnspan=4, pady=(0, 12), sticky="nsew")
+        self._install_display_bindings(display)
         display.focus_set()
         self.display = display
 
@@ -185,68 +346,52 @@ class CalculatorApp:
             [
                 ("¹⁄ₓ", self.apply_reciprocal, "Kehrwert (1/x)"),
                 ("%", self.apply_percent, "Prozent"),
-                ("(", lambda: self.append("("), "Klammer auf"),
-                (")", lambda: self.append(")"), "Klammer zu"),
+                ("(", functools.partial(self.append, "("), "Klammer auf"),
+                (")", functools.partial(self.append, ")"), "Klammer zu"),
             ],
             [
-                ("ˣʸ", lambda: self.append("**"), "Potenz (x^y)"),
+                ("ˣʸ", functools.partial(self.append, "**"), "Potenz (x^y)"),
                 ("ˣ²", self.apply_square, "Quadrat"),
                 ("√", self.apply_sqrt, "Quadratwurzel"),
-                ("/", lambda: self.append("/"), "Division"),
+                ("/", functools.partial(self.append, "/"), "Division"),
             ],
             [
-                ("7", lambda: self.append("7"), "Ziffer 7"),
-                ("8", lambda: self.append("8"), "Ziffer 8"),
-                ("9", lambda: self.append("9"), "Ziffer 9"),
-                ("×", lambda: self.append("*"), "Multiplikation"),
+                ("7", functools.partial(self.append, "7"), "Ziffer 7"),
+                ("8", functools.partial(self.append, "8"), "Ziffer 8"),
+                ("9", functools.partial(self.append, "9"), "Ziffer 9"),
+                ("×", functools.partial(self.append, "*"), "Multiplikation"),
             ],
             [
-                ("4", lambda: self.append("4"), "Ziffer 4"),
-                ("5", lambda: self.append("5"), "Ziffer 5"),
-                ("6", lambda: self.append("6"), "Ziffer 6"),
-                ("−", lambda: self.append("-"), "Subtraktion"),
+                ("4", functools.partial(self.append, "4"), "Ziffer 4"),
+                ("5", functools.partial(self.append, "5"), "Ziffer 5"),
+                ("6", functools.partial(self.append, "6"), "Ziffer 6"),
+                ("−", functools.partial(self.append, "-"), "Subtraktion"),
             ],
             [
-                ("1", lambda: self.append("1"), "Ziffer 1"),
-                ("2", lambda: self.append("2"), "Ziffer 2"),
-                ("3", lambda: self.append("3"), "Ziffer 3"),
-                ("+", lambda: self.append("+"), "Addition"),
+                ("1", functools.partial(self.append, "1"), "Ziffer 1"),
+                ("2", functools.partial(self.append, "2"), "Ziffer 2"),
+                ("3", functools.partial(self.append, "3"), "Ziffer 3"),
+                ("+", functools.partial(self.append, "+"), "Addition"),
             ],
             [
                 ("±", self.negate, "Vorzeichen ändern"),
-                ("0", lambda: self.append("0"), "Ziffer 0"),
-                (".", lambda: self.append(","), "Dezimaltrennzeichen"),
+                ("0", functools.partial(self.append, "0"), "Ziffer 0"),
+                (".", functools.partial(self.append, ","), "Dezimaltrennzeichen"),
                 ("=", self.evaluate, "Berechnen"),
             ],
         ]
 
-        common_btn = {
-            "font": ("Segoe UI", 14, "bold"),
-            "width": 4,
-            "height": 2,
-            "bg": self.colors["btn"],
-            "fg": self.colors["btn_text"],
-            "activebackground": self.colors["btn_active"],
-            "activeforeground": self.colors["btn_active_fg"],
-            "bd": 0,
-            "relief": "flat",
-            "highlightthickness": 0,
-            "cursor": "hand2",
-        }
-
         for r, row in enumerate(buttons, start=2):
             for c, (label, command, tooltip_text) in enumerate(row):
-                btn_style = dict(common_btn)
                 if label == "=":
-                    btn_style["bg"] = self.colors["accent"]
-                    btn_style["fg"] = self.colors["btn_active_fg"]
-                    btn_style["activebackground"] = self.colors["btn_active"]
+                    btn_style = self._EQUALS_BTN
                 elif label in "0123456789":
-                    # Make number buttons lighter
-                    btn_style["bg"] = "#374151"
+                    btn_style = self._DIGIT_BTN
+                else:
+                    btn_style = self._COMMON_BTN
                 btn = tk.Button(calc_frame, text=label, command=command, **btn_style)
                 btn.grid(row=r, column=c, sticky="nsew", padx=2, pady=2)
-                Tooltip(btn, tooltip_text)
+                Tooltip.attach(btn, tooltip_text)
 
         for i in range(len(buttons) + 2):
             calc_frame.grid_rowconfigure(i, weight=1)
@@ -299,10 +444,29 @@ class CalculatorApp:
 
         self.history_listbox.bind("<Double-Button-1>", self._recall_history)
 
+    def _install_display_bindings(self, display: tk.Text) -> None:
+        """Swap the display's Text class tag for a read-only copy of its bindings.
+
+        Every edit must go through append/backspace/_set_display so _expr_cache stays
+        in sync with the widget; paste is routed through append as well.
+        """
+        if not self.root.bind_class(self._DISPLAY_TAG):
+            for sequence in self.root.bind_class("Text"):
+                if (
+                    "Button" in sequence
+                    or sequence.startswith(("<B1-", "<B2-"))
+                    or "MouseWheel" in sequence
+                    or sequence in self._DISPLAY_VIRTUAL_EVENTS
+                ):
+                    # Copy the Tcl script itself, so the stock behaviour is kept as is.
+                    self.root.bind_class(self._DISPLAY_TAG, sequence, self.root.bind_class("Text", sequence))
+        display.bindtags(tuple(self._DISPLAY_TAG if tag == "Text" else tag for tag in display.bindtags()))
+        display.bind("<<Paste>>", self._handle_paste)
+
     def _bind_keys(self) -> None:
-        # Bind both root and entry to ensure numpad input does not fall through to default Entry insert
+        # The display carries no Text key bindings, so its key events reach these
+        # root bindings once and nothing else inserts into it.
         self.root.bind("<Key>", self._handle_key)
-        self.display.bind("<Key>", self._handle_key)
         self.root.bind("<Return>", self._handle_return)
         self.root.bind("<KP_Enter>", self._handle_return)
         self.root.bind("<BackSpace>", self._handle_backspace)
@@ -311,18 +475,22 @@ class CalculatorApp:
         # Drag and titlebar actions
 
     def append(self, value: str) -> None:
-        current = self._get_display()
-        self._set_display(current + value)
+        self._display_insert(value)
 
     def clear(self) -> None:
         self._set_display("")
 
     def backspace(self) -> None:
-        current = self._get_display()
-        self._set_display(current[:-1])
+        # Also drop a grouping space left exposed at the end ("12 3" -> "12", not "12 ").
+        trimmed = self._expr_cache[:-1].rstrip()
+        removed = len(self._expr_cache) - len(trimmed)
+        self._expr_cache = trimmed
+        self.display.delete(f"end-{removed + 1}c", "end-1c")
+        self.display.mark_set("insert", "end")
+        self._schedule_live_refresh()
 
     def negate(self) -> None:
-        current = self._get_display().strip()
+        current = self._get_display()
         if not current:
             self._set_display("-")
             return
@@ -332,11 +500,11 @@ class CalculatorApp:
             self._set_display("-" + current)
 
     def evaluate(self) -> None:
-        expression = self._get_display().strip()
+        expression = self._get_display()
         try:
             result = SafeEvaluator.evaluate(expression)
             display_value = self._format_number(result)
-            self._set_display(display_value)
+            self._set_display(display_value, live=display_value)
             self._add_to_history(expression, display_value)
         except ZeroDivisionError:
             messagebox.showerror("Fehler", "Division durch 0 ist nicht erlaubt")
@@ -362,14 +530,14 @@ class CalculatorApp:
 
     def copy_expression(self) -> None:
         """Copy the current expression to clipboard."""
-        expression = self._get_display().strip()
+        expression = self._get_display()
         if expression:
             self.root.clipboard_clear()
             self.root.clipboard_append(expression)
 
     def copy_result(self) -> None:
         """Copy the current result (live result) to clipboard."""
-        expression = self._get_display().strip()
+        expression = self._get_display()
         if expression:
             try:
                 result = SafeEvaluator.evaluate(expression)
@@ -380,19 +548,56 @@ class CalculatorApp:
                 messagebox.showerror("Fehler", "Ergebnis konnte nicht kopiert werden")
 
     def _get_display(self) -> str:
-        return self.display.get("1.0", "end-1c")
-
-    def _set_display(self, value: str) -> None:
-        self.display.delete("1.0", "end")
-        self.display.insert("1.0", value)
+        return self._expr_cache
+
+    def _set_display(self, value: str, live: str | None = None) -> None:
+        """Replace the display text.
+
+        Callers that already know the live result for ``value`` pass it as ``live``
+        so it is shown directly instead of being read back and re-evaluated.
+        """
+        if value != self._expr_cache:
+            self._expr_cache = value
+            self.display.delete("1.0", "end")
+            self.display.insert("1.0", value)
+            self.display.mark_set("insert", "end")
+        elif live is None:
+            return  # same text: no Tk rewrite, and the live label (or pending refresh) still fits
+        if live is None:
+            self._schedule_live_refresh()
+            return
+        if self._live_after_id is not None:
+            self.root.after_cancel(self._live_after_id)
+            self._live_after_id = None
+        self._last_expr = value
+        self.live_result_var.set(live)
+
+    def _display_insert(self, value: str) -> None:
+        """Append to the display without rewriting the whole text buffer."""
+        self._expr_cache += value
+        self.display.insert("end-1c", value)
         self.display.mark_set("insert", "end")
-        self._refresh_live_result()
+        self._schedule_live_refresh()
+
+    def _schedule_live_refresh(self) -> None:
+        """Coalesce bursts of edits into a single live-result refresh."""
+        if self._live_after_id is not None:
+            self.root.after_cancel(self._live_after_id)
+        self._live_after_id = self.root.after(self.LIVE_REFRESH_DELAY_MS, self._refresh_live_result)
 
     def _refresh_live_result(self) -> None:
-        expression = self._get_display().strip()
+        self._live_after_id = None
+        expression = self._get_display()
+        if expression == self._last_expr:
+            return
+        self._last_expr = expression
         if not expression:
             self.live_result_var.set("")
             return
+        # Mid-typing states like "1+" or "2*(3" cannot be valid yet; skip the parser.
+        if expression[-1] in "+-*/%(" or expression.count("(") != expression.count(")"):
+            self.live_result_var.set("…")
+            return
         try:
             result = SafeEvaluator.evaluate(expression)
             self.live_result_var.set(self._format_number(result))
@@ -400,13 +605,13 @@ class CalculatorApp:
             self.live_result_var.set("…")
 
     def _apply_unary(self, func, error_msg: str | None = None) -> None:
-        expression = self._get_display().strip()
+        expression = self._get_display()
         if not expression:
             return
         try:
             value = SafeEvaluator.evaluate(expression)
-            new_value = func(value)
-            self._set_display(self._format_number(new_value))
+            display_value = self._format_number(func(value))
+            self._set_display(display_value, live=display_value)
         except ZeroDivisionError:
             messagebox.showerror("Fehler", "Division durch 0 ist nicht erlaubt")
         except ValueError:
@@ -414,41 +619,47 @@ class CalculatorApp:
         except Exception as exc:
             messagebox.showerror("Fehler", str(exc))
 
-    def _format_number(self, value: float) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _format_number(value: float) -> str:
         """Format numbers with space as thousands separator and comma as decimal."""
+        if not math.isfinite(value):
+            raise ValueError("Ungültige Operation")  # inf/nan cannot be shown or parsed back
         if value.is_integer():
-            return f"{int(value):,}".replace(",", " ")
+            return format(int(value), ",").replace(",", " ")
 
-        text = f"{value:.12g}"
-        if "e" in text or "E" in text:
+        text = format(value, ",.12g")
+        if "e" in text:
             return text  # leave scientific notation unchanged
-
-        sign = ""
-        if text.startswith("-"):
-            sign = "-"
-            text = text[1:]
-
-        int_part, _, frac_part = text.partition(".")
-        grouped_int = f"{int(int_part or '0'):,}".replace(",", " ")
-        if frac_part:
-            return f"{sign}{grouped_int},{frac_part}"
-        return f"{sign}{grouped_int}"
+        return text.translate(CalculatorApp._DIGIT_TRANS)
 
     def _add_to_history(self, expression: str, result_str: str) -> None:
         if not expression:
             return
-        self.history.insert(0, (expression, result_str))
-        self.history_listbox.insert(0, f"{expression} = {result_str}")
+        self.history.appendleft((expression, result_str))
+        self._history_pending += 1
+        if self._history_pending == 1:
+            self.history_listbox.after_idle(self._sync_history_listbox)
+
+    def _sync_history_listbox(self) -> None:
+        """Insert all entries added since the last idle tick with one Listbox call."""
+        pending, self._history_pending = self._history_pending, 0
+        lines = [f"{expression} = {result_str}" for expression, result_str in islice(self.history, pending)]
+        self.history_listbox.insert(0, *lines)
+        # The deque already dropped entries beyond HISTORY_LIMIT; trim the listbox to match.
+        self.history_listbox.delete(len(self.history), "end")
 
     def _recall_history(self, event=None) -> None:  # noqa: D401 - simple handler
         selection = self.history_listbox.curselection()
         if not selection:
             return
-        idx = selection[0]
+        # Rows still waiting for _sync_history_listbox sit in front of the listed ones.
+        idx = selection[0] + self._history_pending
         if idx >= len(self.history):
             return
-        expression, _ = self.history[idx]
-        self._set_display(expression)
+        expression, result_str = self.history[idx]
+        # The result is already known, so show it directly instead of re-evaluating.
+        self._set_display(expression, live=result_str)
 
     def _build_titlebar(self) -> None:
         self.titlebar = tk.Frame(self.root, bg=self.colors["title"], height=32, bd=0, highlightthickness=0)
@@ -516,38 +727,27 @@ class CalculatorApp:
     def _apply_dark_titlebar(self) -> None:
         """Try to apply a dark titlebar on Windows 10/11 to match the theme."""
         try:
-            if sys.platform != "win32":
+            if _dwm_set_window_attribute is None:
                 return
             hwnd = self.root.winfo_id()
             DWMWA_USE_IMMERSIVE_DARK_MODE = 20
             value = ctypes.c_int(1)
-            res = ctypes.windll.dwmapi.DwmSetWindowAttribute(
-                wintypes.HWND(hwnd),
-                wintypes.DWORD(DWMWA_USE_IMMERSIVE_DARK_MODE),
-                ctypes.byref(value),
-                ctypes.sizeof(value),
+            res = _dwm_set_window_attribute(
+                hwnd, DWMWA_USE_IMMERSIVE_DARK_MODE, ctypes.byref(value), ctypes.sizeof(value)
             )
             if res != 0:  # fallback for older builds
                 DWMWA_USE_IMMERSIVE_DARK_MODE = 19
-                ctypes.windll.dwmapi.DwmSetWindowAttribute(
-                    wintypes.HWND(hwnd),
-                    wintypes.DWORD(DWMWA_USE_IMMERSIVE_DARK_MODE),
-                    ctypes.byref(value),
-                    ctypes.sizeof(value),
+                _dwm_set_window_attribute(
+                    hwnd, DWMWA_USE_IMMERSIVE_DARK_MODE, ctypes.byref(value), ctypes.sizeof(value)
                 )
         except Exception:
             # Best-effort: ignore if unavailable
             pass
 
     def _handle_key(self, event) -> None:
-        if event.char in "0123456789,+-*/()":
-            self.append(event.char)
-            return "break"
-        if event.char == ".":
-            self.append(",")
-            return "break"
-        if event.char == "^":
-            self.append("**")
+        mapped = _KEY_MAP.get(event.char)
+        if mapped is not None:
+            self.append(mapped)
             return "break"
 
     def _handle_return(self, event) -> str:
@@ -562,6 +762,17 @@ class CalculatorApp:
         self.clear()
         return "break"
 
+    def _handle_paste(self, event) -> str:
+        try:
+            text = self.root.clipboard_get()
+        except tk.TclError:
+            return "break"  # empty clipboard or non-text content
+        # Same mapping as typing: keep accepted characters only, "." becomes ",".
+        pasted = "".join(filter(None, map(_KEY_MAP.get, text)))
+        if pasted:
+            self.append(pasted)
+        return "break"
+
     def run(self) -> None:
         self.root.mainloop()
 